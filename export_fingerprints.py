@@ -0,0 +1,129 @@
+import codecs
+import hashlib
+import json
+import logging
+import os
+
+FINGERPRINT_FIELDS = ("labels", "metadata", "updated_at")
+
+CHANGELOG_HEADERS = ["Category", "Project Name", "Project ID", "Data Row Key", "Change", "Changed Fields"]
+
+
+def row_key(item):
+    # Rows in these datasets have no global_key, so fall back to the data row id
+    data_row = item.get("data_row", {})
+    return data_row.get("global_key") or data_row.get("id") or None
+
+def hash_value(value):
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8', errors='backslashreplace')
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+def label_content(label):
+    # Only what the labeler produced; reviews and performance stats change without a relabel
+    label_details = label.get("label_details", {})
+    return {
+        "id": label.get("id", ""),
+        "annotations": label.get("annotations", {}),
+        "content_last_updated_at": label_details.get("content_last_updated_at") or label_details.get("updated_at"),
+    }
+
+def fingerprint_row(item):
+    labels = {
+        project_id: sorted((label_content(label) for label in project_data.get("labels", [])),
+                           key=lambda label: label["id"] or "")
+        for project_id, project_data in item.get("projects", {}).items()
+    }
+    metadata = sorted(item.get("metadata_fields", []), key=lambda field: field.get("schema_id", ""))
+    return {
+        "labels": hash_value(labels),
+        "metadata": hash_value(metadata),
+        "updated_at": item.get("data_row", {}).get("details", {}).get("updated_at", None),
+    }
+
+def diff_fingerprint(old, new):
+    if old is None:
+        return "added", []
+
+    changed_fields = [field for field in FINGERPRINT_FIELDS if old.get(field) != new[field]]
+    if not changed_fields:
+        return None, []
+    return ("relabeled" if "labels" in changed_fields else "modified"), changed_fields
+
+def diff_export(previous_index, rows):
+    # Returns the new index and a list of (key, change, changed_fields), removals included
+    remaining = dict(previous_index)
+    current_index = {}
+    changes = []
+
+    for item in rows:
+        key = row_key(item)
+        if key is None:
+            logging.warning("Skipping export row without a global_key or data row id")
+            continue
+        if key in current_index:
+            logging.warning(f"Skipping duplicate export row {key}")
+            continue
+
+        current_index[key] = fingerprint_row(item)
+        change, changed_fields = diff_fingerprint(remaining.pop(key, None), current_index[key])
+        if change:
+            changes.append((key, change, changed_fields))
+
+    # Anything left in the previous index was not in this export
+    for key in sorted(remaining):
+        changes.append((key, "removed", []))
+
+    return current_index, changes
+
+def changelog_entry(category, project_name, project_id, key, change, changed_fields):
+    return {
+        "Category": category,
+        "Project Name": project_name,
+        "Project ID": project_id,
+        "Data Row Key": key,
+        "Change": change,
+        "Changed Fields": ";".join(changed_fields),
+    }
+
+def load_fingerprint_index(index_file_name):
+    index = {}
+    if not os.path.exists(index_file_name):
+        return index
+
+    with codecs.open(index_file_name, 'r', encoding='utf-8', errors='replace') as index_file:
+        for line in index_file:
+            try:
+                entry = json.loads(line)
+                index[entry.pop("key")] = entry
+            except (json.JSONDecodeError, KeyError) as e:
+                logging.error(f"Skipping bad fingerprint entry in {index_file_name}: {e}")
+    return index
+
+def build_index_from_export(ndjson_file_name):
+    # Bootstrap a missing index from the previously committed export
+    if not os.path.exists(ndjson_file_name):
+        return {}
+
+    rows = []
+    with codecs.open(ndjson_file_name, 'r', encoding='utf-8', errors='replace') as ndjson_file:
+        for line in ndjson_file:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logging.error(f"Skipping bad export line in {ndjson_file_name}: {e}")
+    index, _ = diff_export({}, rows)
+    return index
+
+def load_previous_index(index_file_name, ndjson_file_name):
+    if os.path.exists(index_file_name):
+        return load_fingerprint_index(index_file_name)
+
+    index = build_index_from_export(ndjson_file_name)
+    logging.info(f"No fingerprint index at {index_file_name}, bootstrapped {len(index)} rows from {ndjson_file_name}")
+    return index
+
+def save_fingerprint_index(index_file_name, index):
+    with codecs.open(index_file_name, 'w', encoding='utf-8', errors='backslashreplace') as index_file:
+        for key in sorted(index):
+            json.dump({"key": key, **index[key]}, index_file, ensure_ascii=False, sort_keys=True)
+            index_file.write('\n')
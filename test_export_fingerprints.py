@@ -0,0 +1,110 @@
+import copy
+import json
+
+from export_fingerprints import (build_index_from_export, changelog_entry, diff_export, fingerprint_row,
+                                 load_fingerprint_index, load_previous_index, save_fingerprint_index)
+
+
+def make_row(row_id, labels=None, metadata=None, updated_at="2024-12-10T22:09:54.295+00:00"):
+    return {
+        "data_row": {"id": row_id, "details": {"updated_at": updated_at}},
+        "metadata_fields": metadata or [{"schema_id": "word_count", "value": 251.0}],
+        "projects": {
+            "project_1": {
+                "labels": labels if labels is not None else [
+                    {
+                        "id": f"{row_id}_label_{i}",
+                        "annotations": {"classifications": [{"value": f"answer_{i}"}]},
+                        "label_details": {"content_last_updated_at": "2024-12-20T17:47:14.114+00:00", "reviews": []},
+                        "performance_details": {"seconds_to_create": 773, "seconds_to_review": 6},
+                    }
+                    for i in range(3)
+                ]
+            }
+        },
+    }
+
+def compare_export(previous_rows, current_rows):
+    previous_index, _ = diff_export({}, previous_rows)
+    current_index, changes = diff_export(previous_index, current_rows)
+    assert set(current_index) == {row["data_row"]["id"] for row in current_rows}
+    return {key: (change, changed_fields) for key, change, changed_fields in changes}
+
+
+def test_unchanged_row_reports_nothing():
+    assert compare_export([make_row("a")], [make_row("a")]) == {}
+
+def test_added_and_removed_rows():
+    changes = compare_export([make_row("a")], [make_row("b")])
+    assert changes == {"a": ("removed", []), "b": ("added", [])}
+
+def test_relabeled_row():
+    row = make_row("a")
+    row["projects"]["project_1"]["labels"][0]["annotations"]["classifications"][0]["value"] = "changed"
+    assert compare_export([make_row("a")], [row]) == {"a": ("relabeled", ["labels"])}
+
+def test_metadata_or_updated_at_only_is_modified():
+    metadata_row = make_row("a", metadata=[{"schema_id": "word_count", "value": 300.0}])
+    assert compare_export([make_row("a")], [metadata_row]) == {"a": ("modified", ["metadata"])}
+
+    updated_row = make_row("a", updated_at="2025-01-01T00:00:00.000+00:00")
+    assert compare_export([make_row("a")], [updated_row]) == {"a": ("modified", ["updated_at"])}
+
+def test_label_order_does_not_matter():
+    row = make_row("a")
+    row["projects"]["project_1"]["labels"].reverse()
+    assert compare_export([make_row("a")], [row]) == {}
+
+def test_reviews_and_performance_do_not_count_as_relabel():
+    row = make_row("a")
+    label = row["projects"]["project_1"]["labels"][0]
+    label["performance_details"]["seconds_to_review"] += 1
+    label["label_details"]["reviews"].append({"action": "Approve"})
+    assert fingerprint_row(row) == fingerprint_row(make_row("a"))
+
+def test_rows_without_a_key_are_skipped():
+    keyless_row = make_row("a")
+    keyless_row["data_row"]["id"] = None
+    index, changes = diff_export({}, [keyless_row, copy.deepcopy(keyless_row), make_row("b")])
+    assert list(index) == ["b"]
+    assert changes == [("b", "added", [])]
+
+def test_labels_without_an_id_do_not_break_sorting():
+    row = make_row("a")
+    row["projects"]["project_1"]["labels"][0]["id"] = None
+    assert fingerprint_row(row)["labels"]
+
+def test_changelog_entry():
+    assert changelog_entry("Core_Reader_A", "10th Grade", "project_1", "a", "modified", ["metadata", "updated_at"]) == {
+        "Category": "Core_Reader_A",
+        "Project Name": "10th Grade",
+        "Project ID": "project_1",
+        "Data Row Key": "a",
+        "Change": "modified",
+        "Changed Fields": "metadata;updated_at",
+    }
+
+def test_index_round_trip(tmp_path):
+    index, _ = diff_export({}, [make_row("b"), make_row("a")])
+
+    index_file_name = str(tmp_path / "project_1.ndjson")
+    save_fingerprint_index(index_file_name, copy.deepcopy(index))
+    assert load_fingerprint_index(index_file_name) == index
+
+def test_bootstrap_index_from_previous_export(tmp_path):
+    ndjson_file_name = tmp_path / "project_export.ndjson"
+    ndjson_file_name.write_text("".join(json.dumps(make_row(row_id)) + "\n" for row_id in ("a", "b")), encoding="utf-8")
+
+    index = build_index_from_export(str(ndjson_file_name))
+    assert index == {"a": fingerprint_row(make_row("a")), "b": fingerprint_row(make_row("b"))}
+    assert build_index_from_export(str(tmp_path / "missing.ndjson")) == {}
+
+def test_previous_index_prefers_stored_index(tmp_path):
+    ndjson_file_name = tmp_path / "project_export.ndjson"
+    ndjson_file_name.write_text(json.dumps(make_row("a")) + "\n", encoding="utf-8")
+    index_file_name = str(tmp_path / "project_1.ndjson")
+
+    assert load_previous_index(index_file_name, str(ndjson_file_name)) == {"a": fingerprint_row(make_row("a"))}
+
+    save_fingerprint_index(index_file_name, {"b": fingerprint_row(make_row("b"))})
+    assert load_previous_index(index_file_name, str(ndjson_file_name)) == {"b": fingerprint_row(make_row("b"))}
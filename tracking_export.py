@@ -7,10 +7,13 @@ import sys
 import tempfile
 import codecs
 import time
+from datetime import datetime
 from dotenv import load_dotenv
 import labelbox as lb
 from labelbox.schema.export_task import ExportTask
 from collections import defaultdict
+from export_fingerprints import (CHANGELOG_HEADERS, changelog_entry, diff_export, load_previous_index,
+                                 row_key, save_fingerprint_index)
 
 # Force UTF-8 encoding for stdout and stderr
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='backslashreplace')
@@ -40,6 +43,8 @@ if not LABELBOX_API_KEY:
 client = lb.Client(api_key=LABELBOX_API_KEY)
 
 DOWNLOAD_PATH = os.path.join(os.getcwd(), "exports")
+FINGERPRINT_PATH = os.path.join(DOWNLOAD_PATH, "_fingerprints")
+TRACKING_DATA_PATH = os.path.join(os.getcwd(), "tracking_data")
 
 
 def custom_encode_error_handler(error):
@@ -362,7 +367,18 @@ def process_ndjson(ndjson_file_path, csv_file_name):
                     logging.error(f"Error processing line: {e}")
                     logging.error(f"Problematic line: {line}")
 
+def write_changelog(changelog_file_name, changelog):
+    with codecs.open(changelog_file_name, 'w', encoding='utf-8-sig', errors='backslashreplace') as csv_file:
+        csv_writer = csv.DictWriter(csv_file, fieldnames=CHANGELOG_HEADERS)
+        csv_writer.writeheader()
+        for entry in changelog:
+            csv_writer.writerow(entry)
+
 def main():
+    changelog = []
+    projects_compared = 0
+    os.makedirs(FINGERPRINT_PATH, exist_ok=True)
+
     for category, project_ids in project_categories.items():
         category_path = os.path.join(DOWNLOAD_PATH, sanitize_text(category.replace(" ", "_")))
 
@@ -384,6 +400,13 @@ def main():
 
                 ndjson_file_name = os.path.join(category_path, f'{project_name}_export.ndjson')
                 csv_file_name = os.path.join(category_path, f'{project_name}_export.csv')
+                # Keyed by project id so renaming or recategorising a project keeps its history
+                index_file_name = os.path.join(FINGERPRINT_PATH, f'{project_id}.ndjson')
+
+                # Sort rows so consecutive exports diff cleanly
+                export_json.sort(key=lambda item: row_key(item) or "")
+                # Read before the NDJSON is overwritten, it seeds the index on the first run
+                previous_index = load_previous_index(index_file_name, ndjson_file_name)
 
                 try:
                     # Write NDJSON file
@@ -394,6 +417,16 @@ def main():
                     logging.info(f"NDJSON file saved locally at {ndjson_file_name}")
                 except IOError as e:
                     logging.error(f"Failed to save NDJSON file: {e}")
+                else:
+                    current_index, changes = diff_export(previous_index, export_json)
+                    try:
+                        save_fingerprint_index(index_file_name, current_index)
+                        changelog.extend(changelog_entry(category, sanitize_text(project.name), project_id, *change)
+                                         for change in changes)
+                        projects_compared += 1
+                        logging.info(f"{len(changes)} changed rows for project {project_name}")
+                    except IOError as e:
+                        logging.error(f"Failed to save fingerprint index: {e}")
 
                 try:
                     # Process to CSV
@@ -406,6 +439,19 @@ def main():
                 logging.error(f"An error occurred with project ID {project_id}: {str(e)}")
                 logging.exception("Exception details:")
 
+    if projects_compared:
+        os.makedirs(TRACKING_DATA_PATH, exist_ok=True)
+        # One file per run, the workflow can run several times a day and each changelog is a delta
+        run_stamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        changelog_file_name = os.path.join(TRACKING_DATA_PATH, f"tracking_changelog_{run_stamp}.csv")
+        try:
+            write_changelog(changelog_file_name, changelog)
+            logging.info(f"Changelog with {len(changelog)} entries saved at {changelog_file_name}")
+        except IOError as e:
+            logging.error(f"Failed to save changelog: {e}")
+    else:
+        logging.warning("No projects were compared, skipping the changelog")
+
     logging.info("Processing completed for all projects.")
 
 if __name__ == "__main__":